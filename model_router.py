@@ -0,0 +1,219 @@
+import re
+import threading
+import time
+
+# Relative cost of each Cortex model (credits per million tokens), used to
+# order candidates from cheapest to most expensive.
+MODEL_COSTS = {
+    "llama3-8b": 0.19,
+    "snowflake-arctic": 0.84,
+    "llama3-70b": 1.21,
+    "mistral-large": 5.10,
+}
+
+# Models considered strong enough for each question complexity
+MODEL_TIERS = {
+    "simple": ["llama3-8b", "snowflake-arctic", "llama3-70b", "mistral-large"],
+    "complex": ["llama3-70b", "mistral-large"],
+}
+
+DEFAULT_LATENCY_SLO = 4.0   # Seconds a routed call should take on average
+DEFAULT_TIMEOUT = 10.0      # Seconds before giving up on a model and falling back
+DEFAULT_DEADLINE = 20.0     # Seconds before giving up on a question across all fallbacks
+DEFAULT_MAX_ERROR_RATE = 0.2
+DEFAULT_ALPHA = 0.3         # Latency EWMA smoothing factor (weight of the newest sample)
+# Error EWMA smoothing factor; kept small so a single failure stays under
+# DEFAULT_MAX_ERROR_RATE and does not take a model out of rotation
+DEFAULT_ERROR_ALPHA = 0.1
+DEFAULT_PROBE_EVERY = 20    # Retry a model that misses the SLO once every N requests
+
+# Words that usually mean the question needs reasoning rather than a lookup
+COMPLEX_KEYWORDS = {
+    "why", "how", "explain", "compare", "comparison", "difference", "differences",
+    "analyze", "analyse", "summarize", "summarise", "evaluate", "pros", "cons",
+    "impact", "recommend", "should", "versus", "vs", "relationship", "trend",
+}
+
+
+def classify_question(question):
+    """Classify a question as "simple" or "complex" using cheap text heuristics."""
+    words = re.findall(r"[a-zA-Z0-9']+", question.lower())
+    if not words:
+        return "simple"
+
+    score = 0
+    if len(words) > 25:
+        score += 2
+    elif len(words) > 12:
+        score += 1
+    score += len(COMPLEX_KEYWORDS.intersection(words))
+    # Several questions or clauses in one message
+    if question.count("?") > 1:
+        score += 1
+    if len(re.findall(r"\b(and|or|but|then)\b", question.lower())) >= 2:
+        score += 1
+
+    return "complex" if score >= 2 else "simple"
+
+
+class ModelStats:
+    """Exponentially weighted latency and error rate for a single model."""
+
+    def __init__(self, alpha=DEFAULT_ALPHA, error_alpha=DEFAULT_ERROR_ALPHA):
+        self.alpha = alpha
+        self.error_alpha = error_alpha
+        self.latency = None  # Seconds; None until the first call completes or times out
+        self.error_rate = 0.0
+        self.calls = 0
+
+    def record(self, latency=None, error=False):
+        """
+        Record one call. Pass latency=None for failures that say nothing about
+        speed (e.g. an immediate error), so they don't drag the latency EWMA down.
+        """
+        self.calls += 1
+        if latency is not None:
+            if self.latency is None:
+                self.latency = latency
+            else:
+                self.latency = self.alpha * latency + (1 - self.alpha) * self.latency
+        self.error_rate = self.error_alpha * (1.0 if error else 0.0) + (1 - self.error_alpha) * self.error_rate
+
+
+class ModelRouter:
+    """
+    Route each question to the cheapest model that meets the latency SLO,
+    falling back to the next candidate when a call times out or fails.
+    """
+
+    def __init__(self, models, complete_fn=None, latency_slo=DEFAULT_LATENCY_SLO,
+                 timeout=DEFAULT_TIMEOUT, deadline=DEFAULT_DEADLINE,
+                 max_error_rate=DEFAULT_MAX_ERROR_RATE, alpha=DEFAULT_ALPHA,
+                 error_alpha=DEFAULT_ERROR_ALPHA, probe_every=DEFAULT_PROBE_EVERY,
+                 costs=None, tiers=None):
+        if not models:
+            raise ValueError("ModelRouter needs at least one model.")
+        self.costs = costs or MODEL_COSTS
+        self.tiers = tiers or MODEL_TIERS
+        # Cheapest first; models without a known cost go last
+        self.models = sorted(models, key=lambda m: self.costs.get(m, float("inf")))
+        self.complete_fn = complete_fn
+        self.latency_slo = latency_slo
+        self.timeout = timeout
+        self.deadline = deadline
+        self.max_error_rate = max_error_rate
+        self.probe_every = probe_every
+        self.requests = 0
+        self.stats = {model: ModelStats(alpha, error_alpha) for model in self.models}
+        # One router can be shared by several app sessions
+        self.lock = threading.Lock()
+
+    def candidates(self, complexity):
+        """Return the models eligible for a complexity, cheapest first."""
+        allowed = self.tiers.get(complexity, self.models)
+        eligible = [m for m in self.models if m in allowed]
+        return eligible or list(self.models)
+
+    def meets_slo(self, model, latency_slo=None):
+        stats = self.stats[model]
+        if latency_slo is None:
+            latency_slo = self.latency_slo
+        # Models without latency data yet get the benefit of the doubt
+        if stats.latency is not None and stats.latency > latency_slo:
+            return False
+        return stats.error_rate <= self.max_error_rate
+
+    def plan(self, question, latency_slo=None):
+        """Return (complexity, ordered list of models to try) for a question."""
+        complexity = classify_question(question)
+        with self.lock:
+            self.requests += 1
+            return complexity, self.order(complexity, latency_slo)
+
+    def order(self, complexity, latency_slo=None):
+        """Return the models to try for a complexity, best candidate first."""
+        eligible = self.candidates(complexity)
+        healthy = [m for m in eligible if self.meets_slo(m, latency_slo)]
+        # If nothing meets the SLO, try the fastest-looking models first
+        degraded = sorted(
+            (m for m in eligible if m not in healthy),
+            key=lambda m: (
+                self.stats[m].error_rate > self.max_error_rate,
+                self.stats[m].latency if self.stats[m].latency is not None else float("inf"),
+            ),
+        )
+        # Periodically send a request to a degraded model so its stats can recover
+        if degraded and self.probe_every and self.requests % self.probe_every == 0:
+            probe = min(degraded, key=lambda m: self.stats[m].calls)
+            return [probe] + [m for m in healthy + degraded if m != probe]
+        return healthy + degraded
+
+    def attempt(self, complete_fn, model, prompt, timeout):
+        """
+        Call complete_fn on a dedicated thread, so a hung call only ties up its
+        own thread. Returns (finished, answer, error, elapsed); elapsed is
+        measured from when the call actually started running.
+        """
+        result = {}
+        started = threading.Event()
+        done = threading.Event()
+
+        def run():
+            result["start"] = time.monotonic()
+            started.set()
+            try:
+                result["answer"] = complete_fn(model, prompt)
+            except Exception as e:
+                result["error"] = e
+            result["end"] = time.monotonic()
+            done.set()
+
+        # Daemon thread: a hung call is abandoned rather than blocking shutdown
+        threading.Thread(target=run, daemon=True).start()
+        started.wait()
+        finished = done.wait(timeout)
+        elapsed = result.get("end", time.monotonic()) - result["start"]
+        return finished, result.get("answer"), result.get("error"), elapsed
+
+    def complete(self, question, prompt, latency_slo=None, complete_fn=None):
+        """
+        Generate a completion for prompt, routing on the complexity of question.
+        latency_slo and complete_fn override the router's SLO and completion
+        function for this call.
+        Returns (answer, model). Raises the last error if every model fails or
+        the overall deadline passes.
+        """
+        complete_fn = complete_fn or self.complete_fn
+        if complete_fn is None:
+            raise ValueError("ModelRouter needs a complete_fn to call the models.")
+        if latency_slo is None:
+            latency_slo = self.latency_slo
+        _, order = self.plan(question, latency_slo)
+        give_up_at = time.monotonic() + self.deadline
+        last_error = None
+        for model in order:
+            remaining = give_up_at - time.monotonic()
+            if remaining <= 0:
+                break
+            timeout = min(self.timeout, remaining)
+            finished, answer, error, elapsed = self.attempt(complete_fn, model, prompt, timeout)
+            if not finished:
+                last_error = TimeoutError(f"{model} did not respond within {timeout:.1f}s")
+                # A call cut short by the deadline still counts once it has
+                # already run past the SLO
+                if timeout >= self.timeout or elapsed > latency_slo:
+                    with self.lock:
+                        self.stats[model].record(elapsed, error=True)
+                continue
+            if error is not None:
+                last_error = error
+                with self.lock:
+                    self.stats[model].record(error=True)
+                continue
+            with self.lock:
+                self.stats[model].record(elapsed)
+            return answer, model
+
+        if last_error is None or time.monotonic() >= give_up_at:
+            last_error = TimeoutError(f"No model answered within the {self.deadline:.1f}s deadline")
+        raise last_error
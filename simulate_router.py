@@ -0,0 +1,182 @@
+import argparse
+import random
+import threading
+import time
+from collections import Counter
+
+from model_router import ModelRouter, classify_question
+
+# Stand-in latency profiles (seconds): median, lognormal spread, error rate.
+# Optional keys: "hang" (never answer) and "fail_calls" (call numbers that fail).
+MODEL_PROFILES = {
+    "llama3-8b": {"median": 1.0, "sigma": 0.3, "error_rate": 0.02},
+    "snowflake-arctic": {"median": 2.0, "sigma": 0.4, "error_rate": 0.02},
+    "llama3-70b": {"median": 3.0, "sigma": 0.5, "error_rate": 0.03},
+    "mistral-large": {"median": 5.0, "sigma": 0.6, "error_rate": 0.05},
+}
+
+FAST_PROFILE = {"median": 0.01, "sigma": 0.0, "error_rate": 0.0}
+
+SCENARIOS = {
+    "default": MODEL_PROFILES,
+    # llama3-8b never answers; the other models answer in 10 ms
+    "hung": {
+        "llama3-8b": dict(FAST_PROFILE, hang=True),
+        "snowflake-arctic": FAST_PROFILE,
+        "llama3-70b": FAST_PROFILE,
+        "mistral-large": FAST_PROFILE,
+    },
+    # llama3-8b fails its first call only, then behaves normally
+    "blip": {
+        "llama3-8b": dict(FAST_PROFILE, fail_calls={0}),
+        "snowflake-arctic": FAST_PROFILE,
+        "llama3-70b": FAST_PROFILE,
+        "mistral-large": FAST_PROFILE,
+    },
+}
+
+SAMPLE_QUESTIONS = [
+    "What is the refund policy?",
+    "Who is the contact for billing?",
+    "List the office locations.",
+    "When does the subscription renew?",
+    "Why did revenue drop last quarter and how does it compare with the previous year?",
+    "Explain the difference between the standard and premium plans, and recommend one for a small team.",
+    "Summarize the main trends in customer churn and evaluate their impact on support costs.",
+]
+
+
+class StandInModel:
+    """
+    Fake Cortex model that sleeps for a sampled latency and sometimes fails.
+    Each call draws from its own RNG seeded by (seed, name, call number), so
+    abandoned calls still running in the background can't change later draws.
+    """
+
+    def __init__(self, name, median, sigma, error_rate, time_scale, seed,
+                 hang=False, fail_calls=()):
+        self.name = name
+        self.median = median
+        self.sigma = sigma
+        self.error_rate = error_rate
+        self.time_scale = time_scale
+        self.seed = seed
+        self.hang = hang
+        self.fail_calls = set(fail_calls)
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, prompt):
+        with self.lock:
+            call = self.calls
+            self.calls += 1
+        rng = random.Random(f"{self.seed}-{self.name}-{call}")
+        latency = self.median * rng.lognormvariate(0, self.sigma)
+        fail = call in self.fail_calls or rng.random() < self.error_rate
+        if self.hang:
+            threading.Event().wait()  # Never returns; the router must time out
+        time.sleep(latency * self.time_scale)
+        if fail:
+            raise RuntimeError("stand-in model error")
+        return f"answer to: {prompt[:40]}"
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_simulation(profiles=MODEL_PROFILES, questions=SAMPLE_QUESTIONS, num_requests=200,
+                   latency_slo=2.5, timeout=6.0, time_scale=0.01, seed=0):
+    """
+    Send num_requests sampled questions through a ModelRouter backed by stand-in
+    models and return a summary dict. Latencies are reported in unscaled seconds.
+    """
+    rng = random.Random(seed)
+    stand_ins = {
+        name: StandInModel(
+            name, p["median"], p["sigma"], p["error_rate"], time_scale, seed,
+            hang=p.get("hang", False), fail_calls=p.get("fail_calls", ()),
+        )
+        for name, p in profiles.items()
+    }
+
+    def complete_fn(model, prompt):
+        return stand_ins[model](prompt)
+
+    router = ModelRouter(
+        list(profiles),
+        complete_fn,
+        latency_slo=latency_slo * time_scale,
+        timeout=timeout * time_scale,
+        deadline=2 * timeout * time_scale,
+    )
+
+    picks = Counter()
+    complexities = Counter()
+    latencies = []
+    failures = 0
+    for _ in range(num_requests):
+        question = rng.choice(questions)
+        complexities[classify_question(question)] += 1
+        start = time.monotonic()
+        try:
+            _, model = router.complete(question, question)
+            picks[model] += 1
+        except Exception:
+            failures += 1
+        latencies.append((time.monotonic() - start) / time_scale)
+
+    return {
+        "picks": dict(picks),
+        "complexities": dict(complexities),
+        "failures": failures,
+        "mean_latency": sum(latencies) / len(latencies) if latencies else 0.0,
+        "p95_latency": percentile(latencies, 95),
+        "ewma_latency": {
+            m: (s.latency / time_scale if s.latency is not None else None)
+            for m, s in router.stats.items()
+        },
+        "ewma_error_rate": {m: s.error_rate for m, s in router.stats.items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate the latency-aware model router.")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="default",
+                        help="hung: llama3-8b never answers; blip: llama3-8b fails one call")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--slo", type=float, default=2.5, help="Latency SLO in seconds")
+    parser.add_argument("--timeout", type=float, default=6.0, help="Per-model timeout in seconds")
+    parser.add_argument("--time-scale", type=float, default=0.01,
+                        help="Multiplier applied to real sleeps so the run finishes quickly")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    profiles = SCENARIOS[args.scenario]
+    summary = run_simulation(
+        profiles=profiles,
+        num_requests=args.requests,
+        latency_slo=args.slo,
+        timeout=args.timeout,
+        time_scale=args.time_scale,
+        seed=args.seed,
+    )
+
+    print(f"Scenario: {args.scenario}  Requests: {args.requests}  SLO: {args.slo}s  Timeout: {args.timeout}s")
+    print(f"Complexity: {summary['complexities']}")
+    print(f"Failures: {summary['failures']}")
+    print(f"End-to-end latency: mean {summary['mean_latency']:.2f}s, p95 {summary['p95_latency']:.2f}s")
+    print("Model            picks  ewma latency  ewma errors")
+    for model in profiles:
+        latency = summary["ewma_latency"][model]
+        latency_str = f"{latency:.2f}s" if latency is not None else "-"
+        print(f"{model:<16} {summary['picks'].get(model, 0):>5}  {latency_str:>12}  "
+              f"{summary['ewma_error_rate'][model]:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
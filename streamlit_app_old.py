@@ -6,6 +6,7 @@ from snowflake.snowpark.context import get_active_session
 from snowflake.snowpark import Session
 from deep_translator import GoogleTranslator  # Translation library
 from bs4 import BeautifulSoup
+from model_router import ModelRouter, DEFAULT_LATENCY_SLO, DEFAULT_TIMEOUT, DEFAULT_DEADLINE
 
 def load_svg(svg_filename):
     with open(svg_filename, "r") as file:
@@ -235,6 +236,10 @@ def init_session_state():
         st.session_state.num_retrieved_chunks = 5  # Default context chunks
     if 'num_chat_messages' not in st.session_state:
         st.session_state.num_chat_messages = 5  # Default chat history messages
+    if 'use_model_router' not in st.session_state:
+        st.session_state.use_model_router = True  # Route questions across MODELS by latency
+    if 'latency_slo' not in st.session_state:
+        st.session_state.latency_slo = DEFAULT_LATENCY_SLO  # Seconds, read on every routed call
 
 def init_messages():
     """Initialize the session state for chat messages.""" 
@@ -312,6 +317,26 @@ def complete(model, prompt):
    # answer = Complete(model, prompt, session=snowpark_session).replace("$", "\$")
     return Complete(model, prompt, session=snowpark_session).replace("$", "\$")
 
+@st.cache_resource
+def get_model_router():
+    """
+    Create the model router once so live latency/error stats are shared across sessions.
+    Each call passes in the current run's complete(), so the router never holds on to
+    an old Snowpark session.
+    """
+    return ModelRouter(MODELS, timeout=DEFAULT_TIMEOUT, deadline=DEFAULT_DEADLINE)
+
+def routed_complete(question, prompt):
+    """
+    Generate a completion, letting the model router pick the model for the question.
+    Returns (answer, model).
+    """
+    if not st.session_state.use_model_router:
+        return complete(st.session_state.model_name, prompt), st.session_state.model_name
+    return get_model_router().complete(
+        question, prompt, latency_slo=st.session_state.latency_slo, complete_fn=complete
+    )
+
 def make_chat_history_summary(chat_history, question):
     """Generate a summary of the chat history combined with the current question.""" 
     prompt = f"""
@@ -432,6 +457,8 @@ def main():
                         <div class="assistant-message">{message["content"]}</div>
                     </div>
                     """, unsafe_allow_html=True)
+                if message.get("model"):
+                    st.caption(f"Answered by {message['model']}")
         else:
             # User message container
             with st.container():
@@ -480,7 +507,7 @@ def main():
                     # Create a prompt for the language model
                     prompt, results = create_prompt(question_translated)
                     # Get the response from the language model
-                    answer = complete(st.session_state.model_name, prompt)
+                    answer, answer_model = routed_complete(question_translated, prompt)
                     # Sanitize the chatbot's response to remove any extra closing tags
                     cleaned_answer = sanitize_chatbot_response(answer)
 
@@ -489,7 +516,7 @@ def main():
                         cleaned_answer = translate_message(cleaned_answer, "es")
 
                     # Add assistant's response to chat history
-                    st.session_state.messages.append({"role": "assistant", "content": cleaned_answer})
+                    st.session_state.messages.append({"role": "assistant", "content": cleaned_answer, "model": answer_model})
 
                     # Display assistant's response in chat message with styled rectangle
                     with st.container():
@@ -502,6 +529,7 @@ def main():
                                 <div class="assistant-message">{cleaned_answer}</div>
                             </div>
                             """, unsafe_allow_html=True)
+                        st.caption(f"Answered by {answer_model}")
             except Exception as e:
                 st.error(f"An error occurred while processing your request: {e}")
 